@@ -2,21 +2,25 @@
 
 import contextlib
 import gettext
+import os
 from collections.abc import AsyncIterator
 from http import HTTPStatus
-from typing import TYPE_CHECKING, TypedDict
+from typing import TYPE_CHECKING, Any, TypedDict
 
 import curl_cffi
 import jinja2
+from curl_cffi import CurlHttpVersion
 from curl_cffi.requests import AsyncSession
 from starlette.applications import Starlette
+from starlette.background import BackgroundTask
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.responses import HTMLResponse, Response
+from starlette.responses import HTMLResponse, Response, StreamingResponse
 from starlette.routing import Mount, Route
 from starlette.staticfiles import StaticFiles
 from starlette.templating import Jinja2Templates
 
+from .metrics import metrics_writer
 from .query import QueryParser, SearchMode
 from .search import MAX_AGE, perform_search
 from .sha import gen_sha
@@ -27,9 +31,13 @@ _TRANSLATION.install()
 if TYPE_CHECKING:
     _ = _TRANSLATION.gettext
 
+# the Docker image is built with a filled cache, see Dockerfile
+os.makedirs("jinja-cache", exist_ok=True)
+
 _ENV = jinja2.Environment(
     autoescape=True,
     loader=jinja2.FileSystemLoader("templates"),
+    bytecode_cache=jinja2.FileSystemBytecodeCache("jinja-cache"),
     lstrip_blocks=True,
     trim_blocks=True,
     extensions=["jinja2.ext.i18n"],
@@ -38,19 +46,56 @@ _ENV.install_gettext_translations(_TRANSLATION)  # type: ignore[attr-defined]
 _ENV.globals["SearchMode"] = SearchMode
 _ENV.filters.update(TEMPLATE_FILTER_MAP)
 
+# compile all templates at startup instead of during the first request
+for _name in _ENV.list_templates():
+    _ENV.get_template(_name)
+
 _TEMPLATES = Jinja2Templates(env=_ENV)
 
 _QUERY_PARSER = QueryParser()
 
+# parts of the template contexts that don't depend on the request, copied
+# before use since TemplateResponse adds the request to the context
+_ERROR_CONTEXT: dict[str, Any] = {"base": "base.html", "title": _("Error")}
+_ERROR_CONTEXT_HTMX: dict[str, Any] = {"base": "htmx.html", "title": _("Error")}
+_INDEX_CONTEXT: dict[str, Any] = {"form_base": "base.html", "title": _("Search")}
+_SEARCH_CONTEXT: dict[str, Any] = {"form_base": "base.html", "load": True}
+_SEARCH_CONTEXT_HTMX: dict[str, Any] = {"form_base": "htmx.html", "load": True}
+_RESULTS_CONTEXT: dict[str, Any] = {
+    "form_base": "base.html",
+    "results_base": "search.html",
+}
+_RESULTS_CONTEXT_HTMX: dict[str, Any] = {"form_base": None, "results_base": "htmx.html"}
+
+_CACHE_HEADERS = {"Cache-Control": f"max-age={MAX_AGE}"}
+_RESULTS_HEADERS = {"Vary": "Accept-Language", **_CACHE_HEADERS}
+
+
+def _session(timeout: float) -> AsyncSession:
+    # curl_cffi only allows 10 concurrent transfers by default, which a single
+    # result page (one request per engine plus proxied images) easily exceeds
+    return AsyncSession(
+        impersonate="chrome",
+        max_clients=256,
+        timeout=timeout,
+        http_version=CurlHttpVersion.V2TLS,
+    )
+
 
 class _State(TypedDict):
     session: AsyncSession
+    img_session: AsyncSession
 
 
 @contextlib.asynccontextmanager
 async def _lifespan(app: Starlette) -> AsyncIterator[_State]:
-    async with AsyncSession(impersonate="chrome") as session:
-        yield {"session": session}
+    async with (
+        _session(timeout=5) as session,
+        # covers the whole transfer, so images need more time to stream
+        _session(timeout=30) as img_session,
+        metrics_writer(),
+    ):
+        yield {"session": session, "img_session": img_session}
 
 
 def http_exception(request: Request, exc: HTTPException) -> Response:
@@ -59,22 +104,14 @@ def http_exception(request: Request, exc: HTTPException) -> Response:
         return _TEMPLATES.TemplateResponse(
             request,
             "error.html",
-            {
-                "base": "htmx.html",
-                "title": _("Error"),
-                "error_message": exc.detail,
-            },
+            _ERROR_CONTEXT_HTMX | {"error_message": exc.detail},
             headers={"HX-Retarget": "#target", "HX-Reswap": "outerHTML"},
         )
     if "text/html" in request.headers.get("Accept", ""):
         return _TEMPLATES.TemplateResponse(
             request,
             "error.html",
-            {
-                "base": "base.html",
-                "title": _("Error"),
-                "error_message": exc.detail,
-            },
+            _ERROR_CONTEXT | {"error_message": exc.detail},
             exc.status_code,
         )
     return Response(exc.detail, exc.status_code, media_type="text/plain")
@@ -85,8 +122,8 @@ def index(request: Request) -> HTMLResponse:
     return _TEMPLATES.TemplateResponse(
         request,
         "index.html",
-        {"form_base": "base.html", "title": _("Search")},
-        headers={"Cache-Control": f"max-age={MAX_AGE}"},
+        _INDEX_CONTEXT.copy(),
+        headers=_CACHE_HEADERS,
     )
 
 
@@ -118,17 +155,9 @@ def search(request: Request) -> Response:
     return _TEMPLATES.TemplateResponse(
         request,
         "search.html",
-        {
-            "form_base": "htmx.html"
-            if "HX-Request" in request.headers
-            else "base.html",
-            "title": query,
-            "query": query,
-            "mode": mode,
-            "page": page,
-            "load": True,
-        },
-        headers={"Cache-Control": f"max-age={MAX_AGE}"},
+        (_SEARCH_CONTEXT_HTMX if "HX-Request" in request.headers else _SEARCH_CONTEXT)
+        | {"title": query, "query": query, "mode": mode, "page": page},
+        headers=_CACHE_HEADERS,
     )
 
 
@@ -147,11 +176,8 @@ async def results(request: Request) -> Response:
     return _TEMPLATES.TemplateResponse(
         request,
         "results.html",
-        {
-            "form_base": None if "HX-Request" in request.headers else "base.html",
-            "results_base": "htmx.html"
-            if "HX-Request" in request.headers
-            else "search.html",
+        (_RESULTS_CONTEXT_HTMX if "HX-Request" in request.headers else _RESULTS_CONTEXT)
+        | {
             "title": query,
             "query": query,
             "mode": mode,
@@ -160,7 +186,7 @@ async def results(request: Request) -> Response:
             "results": rated_results,
             "engine_errors": errors,
         },
-        headers={"Vary": "Accept-Language", "Cache-Control": f"max-age={MAX_AGE}"},
+        headers=_RESULTS_HEADERS,
     )
 
 
@@ -174,22 +200,34 @@ async def img(request: Request) -> Response:
     if sha is None or gen_sha(url) != sha:
         raise HTTPException(401, "Unauthorized")
 
-    async with AsyncSession(impersonate="chrome") as session:
-        try:
-            resp = await session.get(url, headers={"Accept": "image/*"})
-        except curl_cffi.CurlError as e:
-            raise HTTPException(500, str(e)) from e
+    # the URL is signed, so its signature identifies the image
+    headers = {
+        "Cache-Control": f"public, max-age={MAX_AGE * 10}, immutable",
+        "ETag": f'"{sha}"',
+    }
+    if request.headers.get("If-None-Match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        resp = await request.state.img_session.get(
+            url, headers={"Accept": "image/*"}, stream=True
+        )
+    except curl_cffi.CurlError as e:
+        raise HTTPException(500, str(e)) from e
 
     if not HTTPStatus(resp.status_code).is_success:
+        await resp.aclose()
         raise HTTPException(resp.status_code, resp.reason)
 
     if not resp.headers.get("Content-Type", "").startswith("image/"):
+        await resp.aclose()
         raise HTTPException(500, "Not an image")
 
-    return Response(
-        content=resp.content,
+    return StreamingResponse(
+        resp.aiter_content(),
         media_type=resp.headers["Content-Type"],
-        headers={"Cache-Control": f"max-age={MAX_AGE * 10}"},
+        headers=headers,
+        background=BackgroundTask(resp.aclose),
     )
 
 
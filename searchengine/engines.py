@@ -5,15 +5,18 @@ from . import importer  # isort: skip
 import asyncio
 import json
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from enum import Flag, auto
 from html import unescape
 from http import HTTPStatus
+from operator import itemgetter
 from types import ModuleType
-from typing import Literal, Optional, TypedDict
+from typing import Any, Literal, Optional, TypedDict
 from urllib.parse import urlencode, urljoin
 
 import jsonpath_ng
 import jsonpath_ng.ext
+import orjson
 import searx
 import searx.data
 import searx.enginelib
@@ -88,7 +91,7 @@ class Engine(ABC):
         method: HttpMethod = "GET",
     ) -> None:
         """Initialize engine."""
-        self._name = name
+        self._name = name.title().replace(" ", "")
         self.mode = mode
         self.weight = weight
         self.features = features
@@ -156,7 +159,7 @@ class Engine(ABC):
 
     def __str__(self) -> str:
         """Return name of engine in PascalCase."""
-        return self._name.title().replace(" ", "")
+        return self._name
 
 
 _DEFAULT_PARAMS: dict[str, str] = {}
@@ -183,15 +186,22 @@ class _CstmEngine[Path, Element](Engine):
         if mode == SearchMode.IMAGES and src_path is None:
             msg = "src_path is required for image search"
             raise ValueError(msg)
+        if query_key in params:
+            msg = f"params must not contain the query key {query_key}"
+            raise ValueError(msg)
 
         self._url = url
         self._query_key = query_key
         self._params = params
-        self._result_path = result_path
-        self._title_path = title_path
-        self._url_path = url_path
-        self._text_path = text_path
-        self._src_path = src_path
+        # only the query changes between requests, so serialize the rest once
+        self._url_params = f"&{urlencode(params)}" if params else ""
+        self._json_prefix = "{" + json.dumps(query_key) + ": "
+        self._json_suffix = ", " + json.dumps(params)[1:] if params else "}"
+        self._result_path = self._compile_path(result_path)
+        self._title_path = self._compile_path(title_path)
+        self._url_path = self._compile_path(url_path)
+        self._text_path = self._compile_path(text_path)
+        self._src_path = None if src_path is None else self._compile_path(src_path)
 
         super().__init__(
             name,
@@ -205,6 +215,10 @@ class _CstmEngine[Path, Element](Engine):
     def url(self) -> str:
         return self._url
 
+    @staticmethod
+    def _compile_path(path: Path) -> Path:
+        return path
+
     @staticmethod
     @abstractmethod
     def _parse_response(response: Response) -> Element:
@@ -212,7 +226,7 @@ class _CstmEngine[Path, Element](Engine):
 
     @staticmethod
     @abstractmethod
-    def _iter(root: Element, path: Path) -> list[Element]:
+    def _iter(root: Element, path: Path) -> Iterable[Element]:
         pass
 
     @staticmethod
@@ -221,13 +235,13 @@ class _CstmEngine[Path, Element](Engine):
         pass
 
     def _request(self, query: ParsedQuery, params: _Params) -> _Params:
-        data = {self._query_key: str(query), **self._params}
-
         if self._method == "GET":
-            params["url"] = f"{self._url}?{urlencode(data)}"
+            query_param = urlencode({self._query_key: str(query)})
+            params["url"] = f"{self._url}?{query_param}{self._url_params}"
         elif self._method == "POST":
+            query_json = json.dumps(str(query))
             params["url"] = self._url
-            params["data"] = json.dumps(data)
+            params["data"] = f"{self._json_prefix}{query_json}{self._json_suffix}"
         else:
             msg = f"Unsupported method {self._method}"
             raise ValueError(msg)
@@ -237,6 +251,11 @@ class _CstmEngine[Path, Element](Engine):
     def _response(self, response: Response) -> list[Result]:
         root = self._parse_response(response)
 
+        base = str(response.url)
+        origin = f"{response.url.scheme}://{response.url.netloc}"
+
+        images = self.mode == SearchMode.IMAGES
+
         results: list[Result] = []
 
         for result in self._iter(root, self._result_path):
@@ -245,11 +264,18 @@ class _CstmEngine[Path, Element](Engine):
 
             _url = self._get(result, self._url_path)
             assert _url
-            url = Url.parse(urljoin(str(response.url), _url))
+            if _url.startswith(("http://", "https://")):
+                url = Url.parse(_url)
+            elif (
+                _url.startswith("/") and not _url.startswith("//") and "/." not in _url
+            ):
+                url = Url.parse(origin + _url)
+            else:
+                url = Url.parse(urljoin(base, _url))
 
             text = self._get(result, self._text_path)
 
-            if self.mode == SearchMode.IMAGES:
+            if images:
                 src = self._get(result, self._src_path)
                 assert src
                 results.append(ImageResult(title, url, text, Url.parse(src)))
@@ -283,26 +309,88 @@ class _XPathEngine(_CstmEngine[etree.XPath, html.HtmlElement]):
         )
 
 
-class _JSONEngine(_CstmEngine[jsonpath_ng.JSONPath, jsonpath_ng.DatumInContext]):
+class _FieldsGetter:
+    """Fast path for JSON paths that only consist of plain field lookups."""
+
+    def __init__(self, fields: tuple[str, ...]) -> None:
+        self._getters = tuple(map(itemgetter, fields))
+
     @staticmethod
-    def _parse_response(response: Response) -> jsonpath_ng.DatumInContext:
-        return jsonpath_ng.Root().find(response.json())
+    def _fields(path: jsonpath_ng.JSONPath) -> Optional[tuple[str, ...]]:
+        if isinstance(path, jsonpath_ng.Child):
+            if (left := _FieldsGetter._fields(path.left)) is None:
+                return None
+            if (right := _FieldsGetter._fields(path.right)) is None:
+                return None
+            return left + right
+        if (
+            isinstance(path, jsonpath_ng.Fields)
+            and len(path.fields) == 1
+            and path.fields[0] != "*"
+        ):
+            return path.fields
+        return None
+
+    @classmethod
+    def from_path(cls, path: jsonpath_ng.JSONPath) -> Optional["_FieldsGetter"]:
+        """Return a getter for the path or None if the path isn't trivial."""
+        if (fields := cls._fields(path)) is None:
+            return None
+        return cls(fields)
+
+    def __call__(self, value: Any) -> Any:
+        """Look up the fields, raising LookupError or TypeError if one is missing."""
+        for getter in self._getters:
+            value = getter(value)
+        return value
+
+
+type _JSONPath = jsonpath_ng.JSONPath | _FieldsGetter
+
+
+class _JSONEngine(_CstmEngine[_JSONPath, Any]):
+    @staticmethod
+    def _compile_path(path: _JSONPath) -> _JSONPath:
+        if isinstance(path, _FieldsGetter):
+            return path
+        return _FieldsGetter.from_path(path) or path
+
+    @staticmethod
+    def _parse_response(response: Response) -> Any:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            # orjson rejects e.g. lone surrogates, NaN and a BOM
+            return response.json()
 
     @staticmethod
-    def _iter(
-        root: jsonpath_ng.DatumInContext, path: jsonpath_ng.JSONPath
-    ) -> list[jsonpath_ng.DatumInContext]:
-        return path.find(root)
+    def _iter(root: Any, path: _JSONPath) -> Iterable[Any]:
+        if isinstance(path, _FieldsGetter):
+            try:
+                return (path(root),)
+            except (LookupError, TypeError):
+                return ()
+        return (datum.value for datum in path.find(root))
 
     @staticmethod
-    def _get(
-        root: jsonpath_ng.DatumInContext, path: Optional[jsonpath_ng.JSONPath]
-    ) -> str:
-        if path is None or not (elems := path.find(root)):
+    def _get(root: Any, path: Optional[_JSONPath]) -> str:
+        if path is None:
+            return ""
+        if isinstance(path, _FieldsGetter):
+            try:
+                return path(root)  # type: ignore[no-any-return]
+            except (LookupError, TypeError):
+                return ""
+        if not (elems := path.find(root)):
             return ""
         return elems[0].value
 
 
+_IGNORED_KEYS = frozenset(
+    {"suggestion", "correction", "infobox", "number_of_results", "engine_data"}
+)
+
+
 class _SearxEngine(Engine):
     def __init__(
         self,
@@ -429,13 +517,7 @@ class _SearxEngine(Engine):
         results: list[Result] = []
 
         for result in self._engine.response(response):
-            if (
-                "suggestion" in result
-                or "correction" in result
-                or "infobox" in result
-                or "number_of_results" in result
-                or "engine_data" in result
-            ):
+            if not _IGNORED_KEYS.isdisjoint(result):
                 continue
 
             if "answer" in result:
@@ -460,7 +542,7 @@ class _SearxEngine(Engine):
         return self._engine.traits.is_locale_supported(language)
 
 
-_ENGINES = {
+_ENGINES: tuple[Engine, ...] = (
     _SearxEngine("alexandria", features=_Features.SITE),
     # TODO: check if bing does support quotation
     _SearxEngine("bing", weight=1.5, features=_Features.SITE),
@@ -486,21 +568,22 @@ _ENGINES = {
     _SearxEngine("stract", features=_Features.QUOTES | _Features.SITE),
     _SearxEngine("yep", features=_Features.SITE),
     _SearxEngine("yep", mode=SearchMode.IMAGES, features=_Features.SITE),
+)
+
+_ENGINE_HOSTS = {
+    engine: Url.parse(engine.url).netloc.removeprefix("www.") for engine in _ENGINES
 }
 
 
 def get_engines(query: ParsedQuery, mode: SearchMode, page: int) -> set[Engine]:
     """Return list of enabled engines for the language."""
+    required = _Features.required(query, page)
     return {
         engine
         for engine in _ENGINES
         if engine.mode == mode
         if engine.supports_language(query.lang)
-        if _Features.required(query, page)
+        if required
         in engine.features
-        | (
-            _Features.SITE
-            if query.site == Url.parse(engine.url).netloc.removeprefix("www.")
-            else _Features(0)
-        )
+        | (_Features.SITE if query.site == _ENGINE_HOSTS[engine] else _Features(0))
     }
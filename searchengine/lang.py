@@ -1,30 +1,37 @@
 """Module containing utils to work with human language."""
 
+import functools
+
 import regex
 import searx.utils
 
 
 def detect_lang(text: str, languages: list[str]) -> str:
     """Detect language of given text, returning ISO language code."""
+    return _detect_lang(text, tuple(languages))
+
+
+# only the detected language is cached since the model returns all 176 labels
+@functools.lru_cache(maxsize=4096)
+def _detect_lang(text: str, languages: tuple[str, ...]) -> str:
     model = searx.utils._get_fasttext_model()  # noqa: SLF001
     labels, _ = model.predict(" ".join(text.splitlines()), 176)
 
-    langs = [
-        lang
-        for label in labels
-        if (lang := label.removeprefix("__label__")) in languages
-    ] + languages
+    for label in labels:
+        if (lang := label.removeprefix("__label__")) in languages:
+            return lang
 
-    return langs[0]
+    return languages[0]
 
 
+@functools.lru_cache(maxsize=4096)
 def is_lang(text: str, expected_lang: str) -> float:
     """Check to which confidence score the given text matches the expected language."""
     model = searx.utils._get_fasttext_model()  # noqa: SLF001
     labels, scores = model.predict(" ".join(text.splitlines()), 176)
 
     if f"__label__{expected_lang}" in labels:
-        return scores[labels.index(f"__label__{expected_lang}")]
+        return float(scores[labels.index(f"__label__{expected_lang}")])
 
     return 0.0
 
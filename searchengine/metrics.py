@@ -1,11 +1,16 @@
 """Module to store metrics about engines."""
 
+import asyncio
 import contextlib
 import sqlite3
+import traceback
+from collections.abc import AsyncIterator
 
 from .engines import Engine
 from .template_filter import TEMPLATE_FILTER_MAP
 
+_FLUSH_INTERVAL = 10
+
 
 def _create_tables(con: sqlite3.Connection) -> None:
     con.execute("""
@@ -25,24 +30,66 @@ def _create_tables(con: sqlite3.Connection) -> None:
     """)
 
 
+_CON = sqlite3.connect("metrics.db", check_same_thread=False)
+_CON.execute("PRAGMA journal_mode=WAL")
+_CON.execute("PRAGMA synchronous=NORMAL")
+with _CON:
+    _create_tables(_CON)
+
+_SUCCESS_ROWS: list[tuple[str, int, float]] = []
+_ERROR_ROWS: list[tuple[str, str]] = []
+
+
 def metric_success(engine: Engine, result_count: int, time: float) -> None:
-    """Store success metrics in database."""
-    with contextlib.closing(sqlite3.connect("metrics.db")) as con, con:
-        _create_tables(con)
-        con.execute(
-            "INSERT INTO success (engine, result_count, time) VALUES (?, ?, ?)",
-            (str(engine), result_count, time),
-        )
+    """Queue success metrics to be stored in database."""
+    _SUCCESS_ROWS.append((str(engine), result_count, time))
 
 
 def metric_errors(errors: dict[Engine, Exception]) -> None:
-    """Store engine error metrics in database."""
-    with contextlib.closing(sqlite3.connect("metrics.db")) as con, con:
-        _create_tables(con)
-        con.executemany(
-            "INSERT INTO error (engine, error) VALUES (?, ?)",
-            [
-                (str(engine), TEMPLATE_FILTER_MAP["pretty_exc"](exc))
-                for engine, exc in errors.items()
-            ],
-        )
+    """Queue engine error metrics to be stored in database."""
+    _ERROR_ROWS.extend(
+        (str(engine), TEMPLATE_FILTER_MAP["pretty_exc"](exc))
+        for engine, exc in errors.items()
+    )
+
+
+def flush_metrics() -> None:
+    """Write all queued metrics to the database in a single transaction.
+
+    If writing fails, the error is printed and the queued metrics are dropped.
+    """
+    if not _SUCCESS_ROWS and not _ERROR_ROWS:
+        return
+
+    try:
+        with _CON:
+            _CON.executemany(
+                "INSERT INTO success (engine, result_count, time) VALUES (?, ?, ?)",
+                _SUCCESS_ROWS,
+            )
+            _CON.executemany(
+                "INSERT INTO error (engine, error) VALUES (?, ?)", _ERROR_ROWS
+            )
+    except sqlite3.Error as e:
+        # drop the rows instead of letting the buffers grow unbounded
+        traceback.print_exception(e)
+    finally:
+        _SUCCESS_ROWS.clear()
+        _ERROR_ROWS.clear()
+
+
+async def _flush_periodically() -> None:
+    while True:
+        await asyncio.sleep(_FLUSH_INTERVAL)
+        flush_metrics()
+
+
+@contextlib.asynccontextmanager
+async def metrics_writer() -> AsyncIterator[None]:
+    """Flush queued metrics in the background and once more on exit."""
+    task = asyncio.create_task(_flush_periodically())
+    try:
+        yield
+    finally:
+        task.cancel()
+        flush_metrics()
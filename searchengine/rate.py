@@ -128,18 +128,25 @@ class RatedResult:
 
 def rate_results(results: dict[Engine, list[Result]], lang: str) -> list[RatedResult]:
     """Combine results from all engines and rate them."""
-    rated_results: set[RatedResult] = set()
+    rated_answers: list[RatedResult] = []
+    rated_results: dict[Url, RatedResult] = {}
 
     for engine, result_list in results.items():
         for i, result in enumerate(result_list):
             rating = (1.25**-i) * 10
-            for rated_result in rated_results:
-                if rated_result.update(result, rating, engine):
-                    break
+            if isinstance(result, AnswerResult):
+                rated_answers.append(RatedResult(result, rating, engine))
+                continue
+
+            url = _comparable_url(result.url)
+            if (rated_result := rated_results.get(url)) is not None:
+                updated = rated_result.update(result, rating, engine)
+                assert updated
             else:
-                rated_results.add(RatedResult(result, rating, engine))
+                rated_results[url] = RatedResult(result, rating, engine)
 
-    for rated_result in rated_results:
+    all_results = rated_answers + list(rated_results.values())
+    for rated_result in all_results:
         rated_result.eval(lang)
 
-    return heapq.nlargest(12, rated_results)
+    return heapq.nlargest(12, all_results)
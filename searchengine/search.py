@@ -13,6 +13,7 @@ from .rate import RatedResult, rate_results
 from .results import Result
 
 MAX_AGE = 60 * 60
+_PRIO_TIMEOUT = 3
 
 
 @aiocache.cached(noself=True, ttl=MAX_AGE)
@@ -39,9 +40,17 @@ async def perform_search(
         for engine in engines
     }
 
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
     prio_tasks = {task for task, engine in tasks.items() if engine.weight > 1}
-    await asyncio.wait(prio_tasks)
-    max_time = max(task.result()[1] for task in prio_tasks)
+    done: set[asyncio.Task[tuple[list[Result], float]]] = set()
+    if prio_tasks:
+        done, _ = await asyncio.wait(prio_tasks, timeout=_PRIO_TIMEOUT)
+    max_time = max(
+        (task.result()[1] for task in done if task.exception() is None),
+        default=loop.time() - start,
+    )
 
     await asyncio.wait(tasks.keys(), timeout=max(max_time * 0.5, 1 - max_time))
     for task, engine in tasks.items():
@@ -13,37 +13,36 @@ from .url import Url
 
 
 def _highlight(string: str, query: ParsedQuery) -> markupsafe.Markup:
-    higlights: list[tuple[int, int]] = []
-    for word in query.words:
-        pos = 0
-        while (pos := string.lower().find(word.lower(), pos)) >= 0:
-            start = pos
-            end = pos + len(word)
-
-            for s, e in higlights:
-                if s <= start <= e:
-                    start = s
-                if s <= end <= e:
-                    end = e
-
-            higlights = [(s, e) for s, e in higlights if e < start or s > end]
-            higlights.append((start, end))
+    lower = string.lower()
 
+    matches: list[tuple[int, int]] = []
+    for word in {word.lower() for word in query.words}:
+        pos = 0
+        while (pos := lower.find(word, pos)) >= 0:
+            matches.append((pos, pos + len(word)))
             pos += 1
 
+    # merge overlapping and adjacent matches
+    highlights: list[tuple[int, int]] = []
+    for start, end in sorted(matches):
+        if highlights and start <= highlights[-1][1]:
+            highlights[-1] = (highlights[-1][0], max(highlights[-1][1], end))
+        else:
+            highlights.append((start, end))
+
     pend = 0
-    result = markupsafe.Markup("")
-    for start, end in sorted(higlights):
-        result += (
-            markupsafe.escape(string[pend:start])
-            + markupsafe.Markup("<b>")
-            + markupsafe.escape(string[start:end])
-            + markupsafe.Markup("</b>")
+    parts: list[str] = []
+    for start, end in highlights:
+        parts += (
+            string[pend:start],
+            markupsafe.Markup("<b>"),
+            string[start:end],
+            markupsafe.Markup("</b>"),
         )
         pend = end
-    result += markupsafe.escape(string[pend:])
+    parts.append(string[pend:])
 
-    return result
+    return markupsafe.Markup("").join(parts)
 
 
 def _pretty_url(url: Url) -> markupsafe.Markup:
@@ -1,10 +1,17 @@
 """Tests to test the engines."""
 
+from typing import Optional
+
+import jsonpath_ng
+import jsonpath_ng.ext
+import orjson
 import pydantic
 import pytest
 from curl_cffi.requests import AsyncSession
-from searchengine.engines import _ENGINES, Engine, _Params
+from searchengine.engines import _ENGINES, Engine, _FieldsGetter, _JSONEngine, _Params
 from searchengine.query import ParsedQuery
+from searchengine.results import WebResult
+from searchengine.url import Url
 
 _Params.__pydantic_config__ = pydantic.ConfigDict(  # type: ignore[attr-defined]
     strict=True, str_min_length=1
@@ -35,3 +42,152 @@ async def test_request(engine: Engine) -> None:
 
     with pytest.raises(_ExitEarlyError):
         await engine.search(_SESSION, _QUERY, 1)
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        (jsonpath_ng.parse("'网址'"), ("网址",)),
+        (jsonpath_ng.parse("'信息'.'标题'"), ("信息", "标题")),
+        (jsonpath_ng.parse("a.b.c"), ("a", "b", "c")),
+        (jsonpath_ng.parse("$.a"), None),
+        (jsonpath_ng.parse("a[0]"), None),
+        (jsonpath_ng.parse("*"), None),
+        (jsonpath_ng.ext.parse("'结果'[?'信息'.'标题' != '']"), None),
+    ],
+)
+def test_fields_getter_from_path(
+    path: jsonpath_ng.JSONPath, expected: Optional[tuple[str, ...]]
+) -> None:
+    """Test that only plain field lookups get a fast path."""
+    getter = _FieldsGetter.from_path(path)
+    if expected is None:
+        assert getter is None
+    else:
+        assert getter is not None
+        value = "value"
+        for field in reversed(expected):
+            value = {field: value}
+        assert getter(value) == "value"
+
+
+class _Response:
+    def __init__(self, url: str, data: object) -> None:
+        self.url = Url.parse(url)
+        self.content = orjson.dumps(data)
+
+
+_JSON_ENGINE = _JSONEngine(
+    "json",
+    url="https://example.com/api/search",
+    result_path=jsonpath_ng.ext.parse("'结果'[?'信息'.'标题' != '']"),
+    url_path=jsonpath_ng.parse("'网址'"),
+    title_path=jsonpath_ng.parse("'信息'.'标题'"),
+    text_path=jsonpath_ng.parse("'信息'.'描述'"),
+)
+
+
+def test_json_engine_response() -> None:
+    """Test parsing of a sese-like JSON response."""
+    response = _Response(
+        "https://example.com/api/search?q=query",
+        {
+            "结果": [
+                {"网址": "/a", "信息": {"标题": "A", "描述": "text"}},
+                {"网址": "https://example.org/b", "信息": {"标题": "B"}},
+                {"网址": "/c", "信息": "not a dict"},
+                {"网址": "/d"},
+                {"网址": "/e", "信息": {"标题": ""}},
+                "not a dict",
+            ]
+        },
+    )
+
+    assert _JSON_ENGINE._response(response) == [  # type: ignore[arg-type]
+        WebResult("A", Url.parse("https://example.com/a"), "text"),
+        WebResult("B", Url.parse("https://example.org/b"), ""),
+    ]
+    assert _JSON_ENGINE._get({"信息": "not a dict"}, _JSON_ENGINE._title_path) == ""
+    assert _JSON_ENGINE._get({}, _JSON_ENGINE._title_path) == ""
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://example.org/a", "https://example.org/a"),
+        ("http://example.org/a", "http://example.org/a"),
+        ("/a", "https://example.com/a"),
+        ("/a/../b", "https://example.com/b"),
+        ("/a/./b", "https://example.com/a/b"),
+        ("//example.org/a", "https://example.org/a"),
+        ("a", "https://example.com/api/a"),
+        ("../a", "https://example.com/a"),
+    ],
+)
+def test_result_url(url: str, expected: str) -> None:
+    """Test resolving of result URLs against the response URL."""
+    response = _Response(
+        "https://example.com/api/search?q=query",
+        {"结果": [{"网址": url, "信息": {"标题": "title"}}]},
+    )
+    (result,) = _JSON_ENGINE._response(response)  # type: ignore[arg-type]
+    assert str(result.url) == expected
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "data"),
+    [
+        (
+            "GET",
+            "https://example.com/api/search?q=caf%C3%A9+%22a+b%22&slice=0%3A12",
+            None,
+        ),
+        (
+            "POST",
+            "https://example.com/api/search",
+            '{"q": "caf\\u00e9 \\"a b\\"", "slice": "0:12"}',
+        ),
+    ],
+)
+def test_cstm_engine_request(method: str, url: str, data: Optional[str]) -> None:
+    """Test the exact URL and body of custom engine requests."""
+    engine = _JSONEngine(
+        "json",
+        method=method,  # type: ignore[arg-type]
+        url="https://example.com/api/search",
+        params={"slice": "0:12"},
+        result_path=jsonpath_ng.parse("results"),
+        url_path=jsonpath_ng.parse("url"),
+        title_path=jsonpath_ng.parse("title"),
+        text_path=jsonpath_ng.parse("text"),
+    )
+    params = engine._request(
+        ParsedQuery(["café", "a b"], "en", None),
+        _Params(
+            cookies={},
+            data=None,
+            headers={},
+            language="en",
+            method=method,  # type: ignore[typeddict-item]
+            pageno=1,
+            safesearch=2,
+            searxng_locale="en",
+            time_range=None,
+        ),
+    )
+    assert params["url"] == url
+    assert params["data"] == data
+
+
+def test_cstm_engine_query_key_in_params() -> None:
+    """Test that params can't override the query."""
+    with pytest.raises(ValueError, match="query key"):
+        _JSONEngine(
+            "json",
+            url="https://example.com/api/search",
+            params={"q": "constant"},
+            result_path=jsonpath_ng.parse("results"),
+            url_path=jsonpath_ng.parse("url"),
+            title_path=jsonpath_ng.parse("title"),
+            text_path=jsonpath_ng.parse("text"),
+        )
@@ -3,8 +3,9 @@
 import enum
 
 import pytest
+from searchengine import rate
 from searchengine.engines import Engine
-from searchengine.rate import RatedResult
+from searchengine.rate import RatedResult, rate_results
 from searchengine.results import AnswerResult, ImageResult, Result, WebResult
 from searchengine.url import Url
 
@@ -95,3 +96,33 @@ def test_rated_result_update(a: Result, b: Result, expected: bool) -> None:
     assert result.update(b, 2, _ENGINE2) == expected
     assert result.rating == (3 if expected else 1)
     assert result.engines == ({_ENGINE, _ENGINE2} if expected else {_ENGINE})
+
+
+def test_rate_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that results with equivalent URLs are merged, but answers are not."""
+    monkeypatch.setattr(rate, "is_lang", lambda text, lang: 1.0)
+
+    results = rate_results(
+        {
+            _ENGINE: [
+                WebResult("web", Url.parse("http://www.example.com/page"), "text"),
+                _ANSWER,
+            ],
+            _ENGINE2: [
+                WebResult("web", Url.parse("https://example.com/page#frag"), "text"),
+                _ANSWER,
+            ],
+        },
+        "en",
+    )
+
+    web = [r for r in results if r.result_type() == "web"]
+    answers = [r for r in results if r.result_type() == "answer"]
+    assert len(web) == 1
+    assert web[0].engines == {_ENGINE, _ENGINE2}
+    assert web[0].result.url.scheme == "https"
+    assert len(answers) == 2
+    assert {frozenset(a.engines) for a in answers} == {
+        frozenset({_ENGINE}),
+        frozenset({_ENGINE2}),
+    }
@@ -0,0 +1,104 @@
+"""Tests for the search module."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+from searchengine import search
+from searchengine.engines import Engine
+from searchengine.query import ParsedQuery, SearchMode
+from searchengine.results import Result, WebResult
+from searchengine.url import Url
+
+_QUERY = ParsedQuery(["query"], "en", None)
+_RESULT = WebResult("web", Url.parse("http://example.com"), "text")
+
+
+class _Engine(Engine):
+    def _request(self):
+        pass
+
+    def _response(self):
+        pass
+
+    def url(self):
+        pass
+
+
+async def _succeed() -> list[Result]:
+    return [_RESULT]
+
+
+async def _fail() -> list[Result]:
+    raise RuntimeError
+
+
+async def _hang() -> list[Result]:
+    await asyncio.sleep(10)
+    return [_RESULT]
+
+
+def _patch(
+    monkeypatch: pytest.MonkeyPatch,
+    engines: dict[Engine, Callable[[], Awaitable[list[Result]]]],
+) -> None:
+    async def _engine_search(
+        session: object, engine: Engine, query: ParsedQuery, page: int
+    ) -> tuple[list[Result], float]:
+        return await engines[engine](), 0.0
+
+    monkeypatch.setattr(search, "get_engines", lambda *_: set(engines))
+    monkeypatch.setattr(search, "_engine_search", _engine_search)
+    monkeypatch.setattr(search, "metric_success", lambda *_: None)
+    monkeypatch.setattr(search, "metric_errors", lambda *_: None)
+    monkeypatch.setattr(search, "rate_results", lambda results, lang: results)
+
+
+@pytest.mark.asyncio
+async def test_perform_search_without_prio_engines(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a search where no engine has a weight above 1."""
+    engine = _Engine("engine")
+    _patch(monkeypatch, {engine: _succeed})
+
+    results, errors = await search.perform_search(None, _QUERY, SearchMode.WEB, 1)
+
+    assert results == {engine: [_RESULT]}
+    assert errors == {}
+
+
+@pytest.mark.asyncio
+async def test_perform_search_failing_prio_engine(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a failing priority engine is reported as an error."""
+    prio = _Engine("prio", weight=1.5)
+    engine = _Engine("engine")
+    _patch(monkeypatch, {prio: _fail, engine: _succeed})
+
+    results, errors = await search.perform_search(None, _QUERY, SearchMode.WEB, 1)
+
+    assert results == {engine: [_RESULT]}
+    assert errors.keys() == {prio}
+    assert isinstance(errors[prio], RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_perform_search_hanging_prio_engine(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a hanging priority engine doesn't block the search."""
+    prio = _Engine("prio", weight=1.5)
+    engine = _Engine("engine")
+    _patch(monkeypatch, {prio: _hang, engine: _succeed})
+    monkeypatch.setattr(search, "_PRIO_TIMEOUT", 0.1)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results, errors = await search.perform_search(None, _QUERY, SearchMode.WEB, 1)
+
+    assert loop.time() - start < 2
+    assert results == {engine: [_RESULT]}
+    assert errors.keys() == {prio}
+    assert isinstance(errors[prio], TimeoutError)
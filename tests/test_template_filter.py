@@ -23,6 +23,7 @@ from searchengine.template_filter import _highlight
         (["abba"], "abbabba", "<b>abbabba</b>"),
         (["a", "b"], "bca", "<b>b</b>c<b>a</b>"),
         (["a"], "&a&", "&amp;<b>a</b>&amp;"),
+        (["ab", "AB"], "xAby", "x<b>Ab</b>y"),
     ],
 )
 def test_highlight(words: list[str], before: str, after: str) -> None: